@@ -1,13 +1,25 @@
 import json
+import orjson
 import os
+import queue
+import re
 import requests
 import shutil
 import sys
+import threading
+import unicodedata
+import zipfile
 from datetime import datetime
 from logging import basicConfig, getLogger
 from time import sleep
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
 
+from requests.adapters import HTTPAdapter
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
@@ -19,6 +31,89 @@ basicConfig(format="%(asctime)s %(name)s:%(lineno)s [%(levelname)s]: " +
 logger = getLogger(__name__)
 logger.setLevel(Const.LOG_LEVEL)
 
+# Shared session for file downloads, so connections to the file host are
+# kept alive and reused instead of a new TCP+TLS handshake per file.
+# Retries are handled by download_file_with_retry.
+file_session = requests.Session()
+file_adapter = HTTPAdapter(pool_connections=10,
+                           pool_maxsize=Const.FILE_DOWNLOAD_WORKERS * 2,
+                           max_retries=0)
+file_session.mount("http://", file_adapter)
+file_session.mount("https://", file_adapter)
+# The Authorization header is built once and sent with every download.
+file_session.headers.update({
+    "Authorization": "Bearer " +
+    (Const.USER_TOKEN if Const.USE_USER_TOKEN else Const.BOT_TOKEN)
+})
+
+
+class MethodRateLimiter:
+    """
+    Keep a minimum interval between calls of each Slack API method.
+
+    Slack enforces rate limits per method, so each method has its own
+    timestamp of the last call and only the remaining part of the interval
+    is waited.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.last_calls = {}
+        self.method_locks = {}
+        self.lock = threading.Lock()
+
+    def wait(self, method, cancel_event=None):
+        """Wait until the next call of the method is allowed"""
+        with self.lock:
+            method_lock = self.method_locks.setdefault(method, threading.Lock())
+
+        with method_lock:
+            last_call = self.last_calls.get(method)
+            if last_call is not None:
+                wait_time = self.interval - (time.monotonic() - last_call)
+                if wait_time > 0:
+                    logger.debug(f"Waiting {wait_time:.1f} seconds before next {method} call")
+                    wait_or_stop(wait_time, cancel_event)
+            self.last_calls[method] = time.monotonic()
+
+
+# Set when the export is interrupted (e.g. Ctrl-C), so background workers stop
+# instead of finishing their queued work.
+stop_event = threading.Event()
+
+
+class ExportStopped(Exception):
+    """Raised in background workers after the export is stopped"""
+
+
+def wait_or_stop(seconds, cancel_event=None):
+    """
+    Sleep, but raise ExportStopped as soon as the export is stopped or
+    cancel_event is set.
+    """
+    if cancel_event is None:
+        if stop_event.wait(seconds):
+            raise ExportStopped()
+        return None
+
+    # Waits on cancel_event in short slices to also watch stop_event.
+    deadline = time.monotonic() + seconds
+    while True:
+        if stop_event.is_set() or cancel_event.is_set():
+            raise ExportStopped()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        cancel_event.wait(min(remaining, 1))
+
+
+# Paths of the files downloaded in this run, keyed by Slack file ID.
+downloaded_files = {}
+
+# Use longer wait time for conversations methods if not Marketplace app
+conversations_limiter = MethodRateLimiter(
+    Const.CONVERSATIONS_ACCESS_WAIT if not Const.IS_MARKETPLACE_APP else Const.ACCESS_WAIT)
+
 
 def retry_on_rate_limit(func, *args, **kwargs):
     """
@@ -44,20 +139,22 @@ def retry_on_rate_limit(func, *args, **kwargs):
             logger.debug(f"SlackApiError caught: {e}")
             logger.debug(f"Error response: {e.response}")
             
-            # SlackApiError.response is a dict, not an object with get method
-            if isinstance(e.response, dict) and e.response.get('error') == 'ratelimited':
+            # SlackApiError.response is a SlackResponse, which supports get()
+            # like a dict but is not a dict subclass.
+            if e.response is not None and e.response.get('error') == 'ratelimited':
                 retry_count += 1
                 
                 # Try to get retry-after from different possible locations
                 retry_after = 60  # Default to 60 seconds
                 
                 # Check if retry-after is in the response headers (from HTTP response)
-                if hasattr(e, 'headers') and e.headers and 'Retry-After' in e.headers:
-                    retry_after = int(e.headers['Retry-After'])
+                retry_after_header = get_retry_after_header(e.response)
+                if retry_after_header is not None:
+                    retry_after = int(retry_after_header)
                     logger.debug(f"Found Retry-After in headers: {retry_after}")
                 # Check if it's in the response body
-                elif 'retry_after' in e.response:
-                    retry_after = e.response['retry_after']
+                elif e.response.get('retry_after') is not None:
+                    retry_after = e.response.get('retry_after')
                     logger.debug(f"Found retry_after in response: {retry_after}")
                 
                 # Add exponential backoff for repeated retries
@@ -74,82 +171,125 @@ def retry_on_rate_limit(func, *args, **kwargs):
                 func_name = func.__name__ if hasattr(func, '__name__') else 'API call'
                 logger.warning(f"Rate limited on {func_name}. Waiting {retry_after} seconds (retry #{retry_count})")
                 
-                time.sleep(retry_after)
+                wait_or_stop(retry_after)
             else:
                 raise  # Re-raise non-rate-limit errors
 
 
-def download_file_with_retry(url, headers, timeout):
+def get_retry_after_header(response):
+    """
+    Get the Retry-After header value from a SlackResponse.
+
+    The headers live on SlackApiError.response, not on the error itself.
+    Header names are matched case-insensitively.
+
+    Returns:
+        The header value, or None if it doesn't exist
+    """
+    headers = getattr(response, 'headers', None)
+    if headers is None and isinstance(response, dict):
+        headers = response.get('headers')
+    if not headers:
+        return None
+
+    for name, value in headers.items():
+        if name.lower() == 'retry-after':
+            return value
+    return None
+
+
+def download_file_with_retry(url, dest_path, timeout):
     """
     Download a file with automatic retry on rate limit or temporary failures.
+
+    The response body is streamed in chunks to a ".part" file, so the whole
+    file is never held in memory. The file is moved to dest_path only after
+    the last chunk, so a failed download never leaves a truncated file.
     
     Args:
         url: The URL to download from
-        headers: HTTP headers to send
+        dest_path: The file path to write the downloaded content to
         timeout: Request timeout tuple (connect, read)
         
     Returns:
-        The response object if successful
+        The file path if successful
         
     Raises:
         Exception: For permanent failures
     """
+    part_path = dest_path + ".part"
     retry_count = 0
-    while True:
-        try:
-            response = requests.get(
-                url,
-                headers=headers,
-                timeout=timeout,
-                allow_redirects=True
-            )
+    try:
+        while True:
+            try:
+                response = file_session.get(
+                    url,
+                    timeout=timeout,
+                    allow_redirects=True,
+                    stream=True
+                )
             
-            if response.status_code == 200:
-                return response
-            elif response.status_code == 429:  # Rate limited
-                retry_count += 1
-                retry_after = int(response.headers.get('Retry-After', 60))
+                if response.status_code == 200:
+                    with response, open(part_path, mode="wb") as f:
+                        for chunk in response.iter_content(chunk_size=1 << 16):
+                            if stop_event.is_set():
+                                raise ExportStopped()
+                            f.write(chunk)
+                    os.replace(part_path, dest_path)
+                    return dest_path
+            
+                # Releases the connection before waiting or raising.
+                response.close()
+            
+                if response.status_code == 429:  # Rate limited
+                    retry_count += 1
+                    retry_after = int(response.headers.get('Retry-After', 60))
                 
-                # Add exponential backoff for repeated retries
-                if retry_count > 5:
-                    retry_after = min(retry_after * 2, 300)  # Cap at 5 minutes
+                    # Add exponential backoff for repeated retries
+                    if retry_count > 5:
+                        retry_after = min(retry_after * 2, 300)  # Cap at 5 minutes
                 
-                # Check max retry limit if configured
-                if Const.MAX_RATE_LIMIT_RETRIES > 0 and retry_count >= Const.MAX_RATE_LIMIT_RETRIES:
-                    logger.error(f"Reached maximum retry limit ({Const.MAX_RATE_LIMIT_RETRIES})")
-                    raise Exception(f"Failed to download after {retry_count} retries")
+                    # Check max retry limit if configured
+                    if Const.MAX_RATE_LIMIT_RETRIES > 0 and retry_count >= Const.MAX_RATE_LIMIT_RETRIES:
+                        logger.error(f"Reached maximum retry limit ({Const.MAX_RATE_LIMIT_RETRIES})")
+                        raise Exception(f"Failed to download after {retry_count} retries")
                 
-                logger.warning(f"File download rate limited. Waiting {retry_after} seconds (retry #{retry_count})")
-                time.sleep(retry_after)
-            else:
-                # For other errors, log details and raise
-                logger.error(f"File download failed with status {response.status_code}")
-                logger.debug(f"    URL: {url}")
-                logger.debug(f"    Headers: {response.headers}")
+                    logger.warning(f"File download rate limited. Waiting {retry_after} seconds (retry #{retry_count})")
+                    wait_or_stop(retry_after)
+                else:
+                    # For other errors, log details and raise
+                    logger.error(f"File download failed with status {response.status_code}")
+                    logger.debug(f"    URL: {url}")
+                    logger.debug(f"    Headers: {response.headers}")
                 
-                if len(response.history) > 0:
-                    logger.debug(f"    Redirects: {[r.status_code for r in response.history]}")
-                    logger.debug(f"    Final URL: {response.url}")
+                    if len(response.history) > 0:
+                        logger.debug(f"    Redirects: {[r.status_code for r in response.history]}")
+                        logger.debug(f"    Final URL: {response.url}")
                 
-                raise Exception(f"HTTP {response.status_code} error")
+                    raise Exception(f"HTTP {response.status_code} error")
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Network error during file download: {e}")
-            retry_count += 1
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Network error during file download: {e}")
+                retry_count += 1
             
-            # For network errors, retry with exponential backoff
-            if retry_count > 5:
-                wait_time = min(60 * retry_count, 300)  # Cap at 5 minutes
-            else:
-                wait_time = 10
+                # For network errors, retry with exponential backoff
+                if retry_count > 5:
+                    wait_time = min(60 * retry_count, 300)  # Cap at 5 minutes
+                else:
+                    wait_time = 10
             
-            # Check max retry limit if configured
-            if Const.MAX_RATE_LIMIT_RETRIES > 0 and retry_count >= Const.MAX_RATE_LIMIT_RETRIES:
-                logger.error(f"Reached maximum retry limit ({Const.MAX_RATE_LIMIT_RETRIES})")
-                raise
+                # Check max retry limit if configured
+                if Const.MAX_RATE_LIMIT_RETRIES > 0 and retry_count >= Const.MAX_RATE_LIMIT_RETRIES:
+                    logger.error(f"Reached maximum retry limit ({Const.MAX_RATE_LIMIT_RETRIES})")
+                    raise
             
-            logger.info(f"Retrying download in {wait_time} seconds (retry #{retry_count})...")
-            time.sleep(wait_time)
+                logger.info(f"Retrying download in {wait_time} seconds (retry #{retry_count})...")
+                wait_or_stop(wait_time)
+
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
 
 
 def main():
@@ -175,6 +315,9 @@ def main():
     logger.info(f"General API interval: {Const.ACCESS_WAIT} seconds ({60/Const.ACCESS_WAIT:.1f} requests/minute)")
     
     client = init_webclient()
+
+    # Creates the export directory once, instead of in each save function.
+    Path(Const.EXPORT_BASE_PATH, now).mkdir(parents=True, exist_ok=True)
     
     # Load progress if exists
     progress = load_progress(now)
@@ -197,29 +340,62 @@ def main():
 
     processed_channels = progress.get('processed_channels', [])
     
-    for channel in channels:
-        if channel["id"] in processed_channels:
-            logger.info(f"Skipping already processed channel: {channel['name']}")
-            continue
-            
-        try:
-            messages = get_messages(client, channel["id"])
-            messages = sort_messages(messages)
-            save_messages(messages, channel["name"], now)
-            save_files(messages, channel["name"], now)
-            
-            # Update progress after successful processing
-            processed_channels.append(channel["id"])
-            save_progress(now, {
-                'users_fetched': True,
-                'channels_fetched': True,
-                'processed_channels': processed_channels
-            })
-            
-        except Exception as e:
-            logger.error(f"Error processing channel {channel['name']}: {e}")
-            logger.info("Progress saved. You can resume from this point.")
-            raise
+    # Files of a channel are downloaded in the background while the messages
+    # of the next channel are fetched. Both hit different hosts with
+    # independent rate limits, so the download time is hidden behind the
+    # conversations API waits.
+    files_executor = ThreadPoolExecutor(max_workers=1)
+    pending = None
+
+    try:
+        for channel in channels:
+            if channel["id"] in processed_channels:
+                logger.info(f"Skipping already processed channel: {channel['name']}")
+                continue
+
+            try:
+                # Creates the channel's directory tree once.
+                Path(Const.EXPORT_BASE_PATH, now, channel["name"],
+                     "files").mkdir(parents=True, exist_ok=True)
+
+                pages = get_messages(client, channel["id"])
+                messages = save_messages(pages, channel["name"], now)
+
+                if pending:
+                    previous, pending = pending, None
+                    complete_channel(*previous, processed_channels, now)
+                pending = (channel, files_executor.submit(
+                    save_files, messages, channel["name"], now))
+
+            except Exception as e:
+                logger.error(f"Error processing channel {channel['name']}: {e}")
+                # Keeps the files of the previous channel in the progress.
+                if pending:
+                    previous, pending = pending, None
+                    complete_channel(*previous, processed_channels, now)
+                logger.info("Progress saved. You can resume from this point.")
+                raise
+
+        if pending:
+            complete_channel(*pending, processed_channels, now)
+
+    except BaseException:
+        # Keeps the previous channel in the progress if its files are
+        # already downloaded.
+        if (pending and pending[1].done()
+                and pending[1].exception() is None):
+            processed_channels.append(pending[0]["id"])
+            append_processed_channel(now, pending[0]["id"])
+            pending = None
+
+        # Stops background downloads instead of waiting for them, so that
+        # Ctrl-C exits promptly. Unfinished channels are not recorded in the
+        # progress and are exported again on resume.
+        stop_event.set()
+        files_executor.shutdown(wait=False)
+        raise
+
+    files_executor.shutdown()
 
     archive_data(now)
     
@@ -231,6 +407,15 @@ def main():
     return None
 
 
+def complete_channel(channel, files_future, processed_channels, now):
+    """Wait for the files of a channel and record it as processed"""
+    files_future.result()
+
+    # Update progress after successful processing
+    processed_channels.append(channel["id"])
+    append_processed_channel(now, channel["id"])
+
+
 def init_webclient():
     client = None
 
@@ -246,12 +431,25 @@ def init_webclient():
 
 def get_users(client):
     users = []
+    cursor = None
 
     try:
-        logger.debug("Call users_list (Slack API)")
-        response = retry_on_rate_limit(client.users_list)
-        users = response["members"]
-        sleep(Const.ACCESS_WAIT)
+        while True:
+            logger.debug("Call users_list (Slack API)")
+            users_list = retry_on_rate_limit(
+                client.users_list,
+                cursor=cursor,
+                limit=1000
+            )
+
+            users.extend(users_list["members"])
+            sleep(Const.ACCESS_WAIT)
+
+            cursor = fetch_next_cursor(users_list)
+            if not cursor:
+                break
+            else:
+                logger.debug("  next cursor: " + cursor)
 
     except SlackApiError as e:
         logger.error(f"Failed to get users: {e}")
@@ -288,13 +486,24 @@ def get_accessible_channels(client, users):
         # so takes and appends "real_name" from users_list as "name".
         # And append "@" to the beginning of "name" in the case a im, to
         # distinguish from channel names.
-        channels = [{
-            **x,
-            **{
-                "name":
-                "@" + [y for y in users if y["id"] == x["user"]][0]["real_name"]
-            }
-        } if x["is_im"] else x for x in channels_raw]
+        # Falls back to the user ID if the user is not in users_list.
+        # Since "name" is also used as the directory name, characters which
+        # are not allowed in paths are replaced, and the user ID is appended
+        # if the name is already taken. Names are compared case-insensitively,
+        # as on the default file systems of Windows and macOS.
+        user_by_id = {y["id"]: y for y in users}
+        taken_names = {
+            x["name"].casefold() for x in channels_raw if not x["is_im"]
+        }
+        for x in channels_raw:
+            if x["is_im"]:
+                name = "@" + safe_path_name(
+                    user_by_id.get(x["user"], {}).get("real_name", x["user"]))
+                if name.casefold() in taken_names:
+                    name += "-" + x["user"]
+                x = {**x, **{"name": name}}
+            taken_names.add(x["name"].casefold())
+            channels.append(x)
 
     except SlackApiError as e:
         # Only log errors that weren't already handled by retry logic
@@ -305,113 +514,198 @@ def get_accessible_channels(client, users):
     return channels
 
 
-def ensure_export_directory(now):
-    """Ensure the export directory exists"""
-    export_path = os.path.join(Const.EXPORT_BASE_PATH, now)
-    os.makedirs(export_path, exist_ok=True)
-    return export_path
+def safe_path_name(name):
+    """
+    Make a name usable as a path component on any OS.
+
+    Normalizes to NFC and replaces characters which are not allowed in
+    Windows paths.
+    """
+    name = unicodedata.normalize("NFC", name)
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", name).rstrip(" .")
+    return name or "_"
+
+
+def dump_json(obj, file_path, indent=True):
+    """Write obj as UTF-8 JSON using orjson, compact unless indent is set"""
+    option = orjson.OPT_INDENT_2 if indent else None
+    with open(file_path, mode="wb") as f:
+        f.write(orjson.dumps(obj, option=option))
 
 
 def save_users(users, now):
-    export_path = ensure_export_directory(now)
+    export_path = os.path.join(Const.EXPORT_BASE_PATH, now)
 
     logger.info("Save Users")
     logger.debug("users export path : " + export_path)
 
     file_path = os.path.join(export_path, "users.json")
-    with open(file_path, mode="wt", encoding="utf-8") as f:
-        json.dump(users, f, ensure_ascii=False, indent=2)
+    dump_json(users, file_path)
 
     return None
 
 
 def save_channels(channels, now):
-    export_path = ensure_export_directory(now)
+    export_path = os.path.join(Const.EXPORT_BASE_PATH, now)
 
     logger.info("Save Channels")
     logger.debug("channels export path : " + export_path)
 
     file_path = os.path.join(export_path, "channels.json")
-    with open(file_path, mode="wt", encoding="utf-8") as f:
-        json.dump(channels, f, ensure_ascii=False, indent=2)
+    dump_json(channels, file_path)
+
+    # Maps channel IDs to the directory names.
+    manifest = {
+        x["id"]: {
+            "name": x["name"],
+            "is_im": x.get("is_im", False)
+        } for x in channels
+    }
+    file_path = os.path.join(export_path, "manifest.json")
+    dump_json(manifest, file_path)
 
     return None
 
 
 def get_messages(client, channel_id):
-    messages = []
+    """
+    Fetch messages of a channel page by page.
+
+    Yields:
+        (is_reply, messages) tuples. Channel's messages come newest first,
+        followed by thread's messages as they are fetched.
+    """
     cursor = None
 
+    # Thread's messages are fetched by a background worker while channel's
+    # messages are still paged, since conversations.replies is rate limited
+    # separately from conversations.history.
+    thread_queue = queue.Queue()
+    reply_pages = queue.Queue()
+    cancel_event = threading.Event()
+
     try:
         logger.info("Get Messages of " + channel_id)
 
-        # Stores channel's messages (other than thread's).
-        while True:
-            logger.debug("Call conversations_history (Slack API)")
-            # Use reduced limit for non-Marketplace apps
-            limit_value = 15 if not Const.IS_MARKETPLACE_APP else 200
-            conversations_history = retry_on_rate_limit(
-                client.conversations_history,
-                channel=channel_id,
-                cursor=cursor,
-                limit=limit_value
-            )
-            
-            messages.extend(conversations_history["messages"])
-            # Use longer wait time for conversations methods if not Marketplace app
-            wait_time = Const.CONVERSATIONS_ACCESS_WAIT if not Const.IS_MARKETPLACE_APP else Const.ACCESS_WAIT
-            logger.debug(f"Waiting {wait_time} seconds before next conversations API call")
-            sleep(wait_time)
+        with ThreadPoolExecutor(max_workers=1) as replies_executor:
+            replies_future = replies_executor.submit(
+                get_thread_messages, client, channel_id, thread_queue,
+                reply_pages, cancel_event)
 
-            cursor = fetch_next_cursor(conversations_history)
-            if not cursor:
-                break
-            else:
-                logger.debug("  next cursor: " + cursor)
+            try:
+                # Yields channel's messages (other than thread's).
+                while True:
+                    # The worker only finishes early if it failed, so its
+                    # error is raised right away instead of after paging
+                    # the whole history.
+                    if replies_future.done():
+                        replies_future.result()
+
+                    conversations_limiter.wait("conversations.history")
+                    logger.debug("Call conversations_history (Slack API)")
+                    # Use reduced limit for non-Marketplace apps
+                    limit_value = 15 if not Const.IS_MARKETPLACE_APP else 200
+                    conversations_history = retry_on_rate_limit(
+                        client.conversations_history,
+                        channel=channel_id,
+                        cursor=cursor,
+                        limit=limit_value
+                    )
+
+                    # Queues messages whose has "thread_ts" is equal to "ts".
+                    for x in conversations_history["messages"]:
+                        if "thread_ts" in x and x["thread_ts"] == x["ts"]:
+                            thread_queue.put(x["thread_ts"])
+
+                    yield False, conversations_history["messages"]
+
+                    cursor = fetch_next_cursor(conversations_history)
+                    if not cursor:
+                        break
+                    else:
+                        logger.debug("  next cursor: " + cursor)
+
+                # Tells the worker that no more threads will be queued.
+                thread_queue.put(None)
+
+                # Yields thread's messages until the worker finishes.
+                while True:
+                    page = reply_pages.get()
+                    if page is None:
+                        break
+                    yield True, page
+
+            except BaseException as e:
+                cancel_event.set()
+                thread_queue.put(None)
+                # Wakes the worker from its rate limit waits on Ctrl-C.
+                if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                    stop_event.set()
+                raise
+
+            # Re-raises an error of the worker.
+            replies_future.result()
 
-        # Stores thread's messages.
-        # Extracts messages whose has "thread_ts" is equal to "ts".
-        for parent_message in (
-                x for x in messages
-                if "thread_ts" in x and x["thread_ts"] == x["ts"]):
+    except SlackApiError as e:
+        # Only log errors that weren't already handled by retry logic
+        if e.response.get('error') != 'ratelimited':
+            logger.error(e)
+        raise  # Re-raise to properly handle the error in main()
+
+
+def get_thread_messages(client, channel_id, thread_queue, reply_pages,
+                        cancel_event):
+    """Fetch replies of the threads queued until None is received"""
+    try:
+        while True:
+            # Polls, so the worker also ends when the export is stopped
+            # while this generator is left suspended.
+            try:
+                thread_ts = thread_queue.get(timeout=1)
+            except queue.Empty:
+                if stop_event.is_set():
+                    break
+                continue
+            if thread_ts is None or cancel_event.is_set():
+                break
 
             cursor = None  # Reset cursor for each thread
             while True:
+                # Stops paging the thread once the history fetch failed.
+                if cancel_event.is_set():
+                    break
+
+                conversations_limiter.wait("conversations.replies",
+                                           cancel_event)
                 logger.debug("Call conversations_replies (Slack API): " +
-                             parent_message["ts"])
+                             thread_ts)
                 # Use reduced limit for non-Marketplace apps
                 limit_value = 15 if not Const.IS_MARKETPLACE_APP else 200
                 conversations_replies = retry_on_rate_limit(
                     client.conversations_replies,
                     channel=channel_id,
-                    ts=parent_message["thread_ts"],
+                    ts=thread_ts,
                     cursor=cursor,
                     limit=limit_value
                 )
-                
+
                 # Since parent messages are also returned, excepts them.
-                messages.extend([
+                reply_pages.put([
                     x for x in conversations_replies["messages"]
                     if x["ts"] != x["thread_ts"]
                 ])
-                # Use longer wait time for conversations methods if not Marketplace app
-                wait_time = Const.CONVERSATIONS_ACCESS_WAIT if not Const.IS_MARKETPLACE_APP else Const.ACCESS_WAIT
-                logger.debug(f"Waiting {wait_time} seconds before next conversations API call")
-                sleep(wait_time)
 
-                cursor = fetch_next_cursor(conversations_replies)  # Fixed: was using conversations_history
+                cursor = fetch_next_cursor(conversations_replies)
                 if not cursor:
                     break
                 else:
                     logger.debug("  next cursor: " + cursor)
 
-    except SlackApiError as e:
-        # Only log errors that weren't already handled by retry logic
-        if e.response.get('error') != 'ratelimited':
-            logger.error(e)
-        raise  # Re-raise to properly handle the error in main()
+    finally:
+        # Tells the consumer that no more pages will be put.
+        reply_pages.put(None)
 
-    return messages
+    return None
 
 
 def fetch_next_cursor(api_response):
@@ -425,76 +719,186 @@ def fetch_next_cursor(api_response):
 
 
 def sort_messages(org_messages):
-    sort_messages = sorted(org_messages, key=lambda x: x["ts"])
+    sort_messages = sorted(org_messages, key=itemgetter("ts"))
     return sort_messages
 
 
-def save_messages(messages, channel_name, now):
+def save_messages(pages, channel_name, now):
+    """
+    Save messages of a channel as they are fetched.
+
+    Channel's messages arrive newest first, so a day file is written as soon
+    as an older day shows up, and only the days still being fetched are kept
+    in memory. Thread's messages of written days are buffered and merged
+    into each day file once, after all messages are fetched.
+
+    Returns:
+        The messages which have files
+    """
     export_path = os.path.join(Const.EXPORT_BASE_PATH, now, channel_name)
-    os.makedirs(export_path, exist_ok=True)
 
     logger.info("Save Messages of " + channel_name)
     logger.debug("messages export path : " + export_path)
 
+    file_messages = []
+
     if Const.SPLIT_MESSAGE_FILES:
-        # Get a list of timestamps (Format YY-MM-DD) by excluding duplicate
-        # timestamps in messages.
-        for day_ts in {
-                format_ts(x["ts"]): format_ts(x["ts"])
-                for x in messages
-        }.values():
-            # Extract messages of "day_ts".
-            day_messages = [
-                x for x in messages if format_ts(x["ts"]) == day_ts
-            ]
-
-            file_path = os.path.join(export_path, f"{day_ts}.json")
-            with open(file_path, mode="wt", encoding="utf-8") as f:
-                json.dump(day_messages, f, ensure_ascii=False, indent=2)
+        day_buckets = defaultdict(list)
+        reply_buckets = defaultdict(list)
+        written_days = set()
+
+        for is_reply, page in pages:
+            file_messages.extend(x for x in page if "files" in x)
+
+            # Groups messages by day (Format YY-MM-DD) in a single pass.
+            page_buckets = defaultdict(list)
+            for x in page:
+                page_buckets[format_ts(x["ts"])].append(x)
+
+            for day_ts, day_messages in page_buckets.items():
+                if day_ts in written_days:
+                    # Merging per page would rewrite a day file for every
+                    # reply page.
+                    reply_buckets[day_ts].extend(day_messages)
+                else:
+                    day_buckets[day_ts].extend(day_messages)
+
+            if not is_reply and page:
+                # Days newer than the oldest message of this page are
+                # complete.
+                oldest_day = format_ts(page[-1]["ts"])
+                for day_ts in [x for x in day_buckets if x > oldest_day]:
+                    write_day_messages(day_buckets.pop(day_ts), day_ts,
+                                       export_path, written_days)
+
+        for day_ts, day_messages in day_buckets.items():
+            write_day_messages(
+                day_messages, day_ts, export_path, written_days)
+        for day_ts, day_messages in reply_buckets.items():
+            write_day_messages(
+                day_messages, day_ts, export_path, written_days)
     else:
+        messages = []
+        for _, page in pages:
+            messages.extend(page)
+        file_messages = [x for x in messages if "files" in x]
+
         file_path = os.path.join(export_path, "messages.json")
-        with open(file_path, mode="wt", encoding="utf-8") as f:
-            json.dump(messages, f, ensure_ascii=False, indent=2)
+        dump_json(sort_messages(messages), file_path, indent=False)
+
+    return file_messages
+
+
+def write_day_messages(day_messages, day_ts, export_path, written_days):
+    """Write messages of a day, merging them if the day is already written"""
+    file_path = os.path.join(export_path, f"{day_ts}.json")
+
+    if day_ts in written_days:
+        with open(file_path, mode="rb") as f:
+            day_messages = orjson.loads(f.read()) + day_messages
+
+    # Message files are the bulk of the export, so they are written compact.
+    dump_json(sort_messages(day_messages), file_path, indent=False)
+    written_days.add(day_ts)
 
     return None
 
 
+@lru_cache(maxsize=65536)
 def format_ts(unix_time_str):
     return datetime.fromtimestamp(float(unix_time_str)).strftime("%Y-%m-%d")
 
 
 def save_files(messages, channel_name, now):
     export_path = os.path.join(Const.EXPORT_BASE_PATH, now, channel_name, "files")
-    os.makedirs(export_path, exist_ok=True)
 
     logger.info("Save Files of " + channel_name)
     logger.debug("files export path : " + export_path)
 
-    token = Const.USER_TOKEN if Const.USE_USER_TOKEN else Const.BOT_TOKEN
+    # Downloads files except deleted.
+    # The same file can be shared in several messages, so each file ID is
+    # handled only once.
+    file_infos = {
+        fi["id"]: fi for x in messages if "files" in x
+        for fi in x["files"] if fi["mode"] != "tombstone"
+    }
+
+    # Files are served from a different host than the Slack API, so they
+    # are downloaded concurrently with a bounded number of workers instead
+    # of one by one.
+    futures = []
+    with ThreadPoolExecutor(
+            max_workers=Const.FILE_DOWNLOAD_WORKERS) as executor:
+        for fi in file_infos.values():
+            if stop_event.is_set():
+                break
+            if fi["id"] in downloaded_files:
+                futures.append((fi, executor.submit(
+                    link_file, fi, downloaded_files[fi["id"]], export_path)))
+            else:
+                futures.append((fi, executor.submit(
+                    save_file, fi, export_path)))
 
-    for files in (x["files"] for x in messages if "files" in x):
-        # Downloads files except deleted.
-        for fi in (x for x in files if x["mode"] != "tombstone"):
-            logger.debug("  * Download " + fi["name"])
+    # Logs errors which were not handled in the workers.
+    for fi, future in futures:
+        if future.exception() is not None:
+            logger.error(f"Failed to save file {fi['id']}: {future.exception()}")
+
+    return None
 
-            try:
-                response = download_file_with_retry(
-                    fi["url_private"],
-                    headers={"Authorization": "Bearer " + token},
-                    timeout=(Const.REQUESTS_CONNECT_TIMEOUT,
-                             Const.REQUESTS_READ_TIMEOUT)
-                )
-                
-                file_path = os.path.join(export_path, f"{fi['id']}_{fi['name']}")
-                with open(file_path, mode="wb") as f:
-                    f.write(response.content)
-                logger.debug(f"    Successfully downloaded {fi['name']}")
-                
-            except Exception as e:
-                logger.error(f"Failed to download {fi['name']}: {e}")
-                logger.error(f"URL: {fi['url_private']}")
-            
-            sleep(Const.ACCESS_WAIT)
+
+def link_file(fi, src_path, export_path):
+    """Reuse a file already downloaded for another channel"""
+    name = fi.get("name", fi["id"])
+    file_path = os.path.join(export_path, f"{fi['id']}_{safe_path_name(name)}")
+    if os.path.exists(file_path):
+        return None
+
+    logger.debug("  * Link " + name)
+
+    try:
+        try:
+            os.link(src_path, file_path)
+        except OSError:
+            # Hard links are not supported on some file systems.
+            shutil.copyfile(src_path, file_path)
+
+    except OSError as e:
+        # Downloads the file instead, e.g. if the source was removed.
+        # A partial copy is replaced when the download completes.
+        logger.warning(f"Failed to reuse {name}: {e}")
+        save_file(fi, export_path)
+
+    return None
+
+
+def save_file(fi, export_path):
+    # Drops queued downloads after the export is stopped.
+    if stop_event.is_set():
+        return None
+
+    # Files hidden by the plan limit ("hidden_by_limit") have no "name" or
+    # "url_private", so they fail below and are logged.
+    name = fi.get("name", fi["id"])
+    logger.debug("  * Download " + name)
+
+    try:
+        file_path = os.path.join(export_path, f"{fi['id']}_{safe_path_name(name)}")
+        download_file_with_retry(
+            fi["url_private"],
+            file_path,
+            timeout=(Const.REQUESTS_CONNECT_TIMEOUT,
+                     Const.REQUESTS_READ_TIMEOUT)
+        )
+        downloaded_files[fi["id"]] = file_path
+        logger.debug(f"    Successfully downloaded {name}")
+
+    except ExportStopped:
+        logger.debug(f"    Stopped downloading {name}")
+
+    except Exception as e:
+        logger.error(f"Failed to download {name}: {e}")
+        logger.error(f"URL: {fi.get('url_private')}")
 
     return None
 
@@ -504,7 +908,24 @@ def archive_data(now):
 
     logger.info("Archive data")
 
-    shutil.make_archive(root_path, format='zip', root_dir=root_path)
+    # Downloaded files (images, videos, PDFs, ...) are mostly compressed
+    # already, so they are stored as is. Only JSON files are deflated, with
+    # the fastest compression level.
+    with zipfile.ZipFile(root_path + ".zip", mode="w",
+                         compression=zipfile.ZIP_STORED,
+                         allowZip64=True) as zf:
+        for dir_path, dir_names, file_names in os.walk(root_path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                file_path = os.path.join(dir_path, file_name)
+                arc_name = os.path.relpath(file_path, root_path)
+                if file_name.endswith(".json"):
+                    zf.write(file_path, arc_name,
+                             compress_type=zipfile.ZIP_DEFLATED,
+                             compresslevel=1)
+                else:
+                    zf.write(file_path, arc_name)
+
     shutil.rmtree(root_path)
 
     return None
@@ -513,8 +934,21 @@ def archive_data(now):
 def save_progress(now, progress_data):
     """Save progress to a JSON file for resume capability"""
     progress_path = os.path.join(Const.EXPORT_BASE_PATH, f".progress_{now}.json")
-    with open(progress_path, 'w', encoding='utf-8') as f:
+    # Writes to a temporary file and renames it, so an interrupted write
+    # never leaves a truncated progress file.
+    tmp_path = progress_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(progress_data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, progress_path)
+
+
+def append_processed_channel(now, channel_id):
+    """Append a processed channel ID to the progress log"""
+    log_path = os.path.join(Const.EXPORT_BASE_PATH, f".progress_{now}.channels.log")
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write(channel_id + "\n")
+        f.flush()
+        os.fsync(f.fileno())
 
 
 def load_progress(now):
@@ -522,13 +956,25 @@ def load_progress(now):
     progress_path = os.path.join(Const.EXPORT_BASE_PATH, f".progress_{now}.json")
     if os.path.exists(progress_path):
         with open(progress_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            progress = json.load(f)
+
+        # Processed channels are appended to a separate log, while older
+        # progress files keep them in the JSON file.
+        processed_channels = progress.get('processed_channels', [])
+        log_path = os.path.join(Const.EXPORT_BASE_PATH, f".progress_{now}.channels.log")
+        if os.path.exists(log_path):
+            with open(log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    channel_id = line.strip()
+                    if channel_id and channel_id not in processed_channels:
+                        processed_channels.append(channel_id)
+        progress['processed_channels'] = processed_channels
+
+        return progress
     
     # Check for any recent progress files
-    progress_files = [f for f in os.listdir(Const.EXPORT_BASE_PATH) if f.startswith('.progress_')]
+    progress_files = find_progress_files()
     if progress_files:
-        # Sort by modification time and get the most recent
-        progress_files.sort(key=lambda x: os.path.getmtime(os.path.join(Const.EXPORT_BASE_PATH, x)), reverse=True)
         most_recent = progress_files[0]
         logger.info(f"Found previous progress file: {most_recent}")
         logger.info("Use --resume flag or rename the progress file to match current timestamp to resume")
@@ -536,6 +982,18 @@ def load_progress(now):
     return {}
 
 
+def find_progress_files():
+    """Return progress file names, the most recently modified first"""
+    with os.scandir(Const.EXPORT_BASE_PATH) as it:
+        entries = [
+            e for e in it
+            if e.name.startswith('.progress_') and e.name.endswith('.json')
+        ]
+    # DirEntry caches its stat result, so each file is stat'd only once.
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    return [e.name for e in entries]
+
+
 def cleanup_progress(now):
     """Remove progress file after successful completion"""
     progress_path = os.path.join(Const.EXPORT_BASE_PATH, f".progress_{now}.json")
@@ -543,6 +1001,10 @@ def cleanup_progress(now):
         os.remove(progress_path)
         logger.info("Progress file cleaned up")
 
+    log_path = os.path.join(Const.EXPORT_BASE_PATH, f".progress_{now}.channels.log")
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
 
 def load_users(now):
     """Load users from previously saved file"""
@@ -565,9 +1027,8 @@ def load_channels(now):
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == '--resume':
         # Find the most recent progress file
-        progress_files = [f for f in os.listdir(Const.EXPORT_BASE_PATH) if f.startswith('.progress_')]
+        progress_files = find_progress_files()
         if progress_files:
-            progress_files.sort(key=lambda x: os.path.getmtime(os.path.join(Const.EXPORT_BASE_PATH, x)), reverse=True)
             # Extract timestamp from filename
             timestamp = progress_files[0].replace('.progress_', '').replace('.json', '')
             logger.info(f"Resuming export from {timestamp}")